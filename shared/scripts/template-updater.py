@@ -4,16 +4,157 @@ S-cubed Development Process - Template Updater
 This script helps manage and update project templates across the development process.
 """
 
+import asyncio
+import copy
+import hashlib
 import json
+import mmap
 import os
+import posixpath
 import sys
 import shutil
-import requests
 import zipfile
 import tempfile
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Parse errors raised by whichever JSON reader handled project.json
+_JSON_ERRORS = (json.JSONDecodeError,) + ((ijson.JSONError,) if ijson is not None else ())
+
+def _loads(data):
+    """Parse JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+def _dumps(obj) -> bytes:
+    """Serialise to indented JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    # Match orjson's output so the file doesn't depend on which backend wrote it
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode()
+
+# Archives up to this size are kept in memory while syncing
+SPOOL_MAX_SIZE = 16 * 1024 * 1024
+COPY_BUFFER_SIZE = 128 * 1024
+MAX_IO_WORKERS = min(8, os.cpu_count() or 1)
+
+# Registries larger than this are memory-mapped instead of read into a buffer
+MMAP_THRESHOLD = 1_000_000
+
+def _stat_key(stat: os.stat_result) -> Tuple[int, int, int]:
+    """Identity of a file version: mtime alone misses same-tick rewrites on coarse filesystems"""
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+def _write_bytes(fd: int, data: bytes) -> os.stat_result:
+    """Write bytes straight to an open descriptor, bypassing Python's buffering, then close it and return its stat"""
+    try:
+        # Normally a single write(); loop in case the kernel accepts less
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        # No fsync: registry edits are cheap to redo, so durability isn't worth the flush
+        return os.fstat(fd)
+    finally:
+        os.close(fd)
+
+def _walk_error(error: OSError):
+    """os.walk onerror hook: fail instead of silently skipping directories that can't be listed"""
+    raise error
+
+def _parallel_copytree(src, dst, workers: int = MAX_IO_WORKERS):
+    """Copy a directory tree, copying files concurrently (existing directories are reused)"""
+    jobs = []
+    for root, _dirs, files in os.walk(src, onerror=_walk_error, followlinks=True):
+        target_root = os.path.join(dst, os.path.relpath(root, src))
+        os.makedirs(target_root, exist_ok=True)
+        jobs.extend((os.path.join(root, name), os.path.join(target_root, name)) for name in files)
+    
+    # shutil's copy already uses sendfile/fcopyfile where available; threads overlap the syscalls
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(shutil.copy2, src_file, dst_file) for src_file, dst_file in jobs]
+        for future in futures:
+            future.result()
+
+def _file_digest(path) -> bytes:
+    """blake2b digest of a file's contents"""
+    digest = hashlib.blake2b()
+    with open(path, 'rb') as f:
+        while chunk := f.read(COPY_BUFFER_SIZE):
+            digest.update(chunk)
+    return digest.digest()
+
+def _sync_file(src_file: str, dst_file: str):
+    """Move src_file over dst_file unless dst_file already has the same contents"""
+    try:
+        if (os.path.getsize(dst_file) == os.path.getsize(src_file)
+                and _file_digest(dst_file) == _file_digest(src_file)):
+            return
+    except FileNotFoundError:
+        pass
+    os.replace(src_file, dst_file)
+
+def _remove_path(path: str):
+    """Delete a file, symlink or directory tree"""
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    else:
+        os.remove(path)
+
+def _sync_tree(src, dst, workers: int = MAX_IO_WORKERS):
+    """Make dst mirror src, moving in only changed files (src must be on the same filesystem)"""
+    wanted = set()
+    jobs = []
+    for root, _dirs, files in os.walk(src, onerror=_walk_error):
+        rel_root = os.path.normpath(os.path.relpath(root, src))
+        target_root = os.path.join(dst, rel_root)
+        # isdir() follows symlinks, so a linked directory must be replaced rather than written through
+        if os.path.islink(target_root) or (os.path.lexists(target_root) and not os.path.isdir(target_root)):
+            _remove_path(target_root)
+        os.makedirs(target_root, exist_ok=True)
+        wanted.add(rel_root)
+        
+        for name in files:
+            target = os.path.join(target_root, name)
+            if os.path.islink(target) or os.path.isdir(target):
+                _remove_path(target)
+            wanted.add(os.path.normpath(os.path.join(rel_root, name)))
+            jobs.append((os.path.join(root, name), target))
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_sync_file, src_file, dst_file) for src_file, dst_file in jobs]
+        for future in futures:
+            future.result()
+    
+    # Remove whatever the new version no longer contains
+    for root, dirs, files in os.walk(dst, onerror=_walk_error):
+        rel_root = os.path.normpath(os.path.relpath(root, dst))
+        for name in files + dirs:
+            if os.path.normpath(os.path.join(rel_root, name)) not in wanted:
+                _remove_path(os.path.join(root, name))
+        dirs[:] = [name for name in dirs if os.path.normpath(os.path.join(rel_root, name)) in wanted]
 
 class TemplateUpdater:
     """Manages S-cubed project templates"""
@@ -23,59 +164,213 @@ class TemplateUpdater:
         self.templates_path = self.base_path / "templates"
         self.registry_path = self.base_path / "vscode-extension" / "template-registry.json"
         
-    def load_registry(self) -> Dict:
-        """Load the template registry"""
-        if not self.registry_path.exists():
+        # Parsed registry, reused while the file's mtime, size and inode are unchanged
+        self._registry_cache = None
+        self._registry_stamp = None
+        self._template_index = {}
+        # Serialised form of the cache; readers get a fresh parse of it, which is cheaper than deepcopy
+        self._registry_bytes = None
+        
+        # Set inside batch(): saves only update the cache until the batch exits
+        self._in_batch = False
+        self._registry_dirty = False
+        self._batch_ts = None
+        
+        # Source fingerprints that create_template has already validated, by template ID
+        self._validated = {}
+        
+    def _refresh_registry(self) -> Dict:
+        """Return the cached registry, re-reading it if the file changed"""
+        # Unsaved batch changes win over whatever is on disk
+        if self._registry_dirty:
+            return self._registry_cache
+        
+        try:
+            stat = self.registry_path.stat()
+        except FileNotFoundError:
             raise FileNotFoundError(f"Template registry not found: {self.registry_path}")
         
-        with open(self.registry_path, 'r') as f:
-            return json.load(f)
+        stamp = _stat_key(stat)
+        if self._registry_cache is None or stamp != self._registry_stamp:
+            self._parse_registry(stat.st_size, stamp)
+        
+        return self._registry_cache
+    
+    def _parse_registry(self, size: int, stamp: Tuple[int, int, int]):
+        """Parse the registry file into the cache, memory-mapping it when it is large"""
+        if size <= MMAP_THRESHOLD:
+            data = self.registry_path.read_bytes()
+            self._set_registry_cache(_loads(data), stamp, data)
+            return
+        
+        with open(self.registry_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            with memoryview(mm) as view:
+                self._set_registry_cache(_loads(view), stamp)
+    
+    def _set_registry_cache(self, registry: Dict, stamp: Optional[Tuple[int, int, int]],
+                            data: Optional[bytes] = None):
+        """Cache a parsed registry (and its bytes, if known) and index its templates by ID"""
+        self._registry_cache = registry
+        self._registry_stamp = stamp
+        self._registry_bytes = data
+        self._reindex_templates()
+    
+    def _registry_snapshot(self) -> bytes:
+        """Serialised copy of the current registry, kept until the cache next changes"""
+        registry = self._refresh_registry()
+        if self._registry_bytes is None:
+            self._registry_bytes = _dumps(registry)
+        return self._registry_bytes
+    
+    def _reindex_templates(self):
+        """Rebuild the template ID -> list position index for the cached registry"""
+        self._template_index = {}
+        for position, template in enumerate(self._registry_cache.get('templates', [])):
+            self._template_index.setdefault(template.get('id'), position)
+    
+    def _drop_registry_cache(self):
+        """Forget the cached registry (and any unsaved batch changes) so the next read comes from disk"""
+        self._registry_cache = None
+        self._registry_bytes = None
+        self._registry_dirty = False
+    
+    @contextmanager
+    def _editing_registry(self):
+        """Yield the cached registry for an in-place edit, dropping the cache if the edit fails part-way"""
+        try:
+            yield self._refresh_registry()
+        except BaseException:
+            self._drop_registry_cache()
+            raise
+    
+    def load_registry(self) -> Dict:
+        """Load the template registry"""
+        # Callers mutate the result before saving, so never hand out the cache itself
+        return _loads(self._registry_snapshot())
     
     def save_registry(self, registry: Dict):
         """Save the template registry"""
-        with open(self.registry_path, 'w') as f:
-            json.dump(registry, f, indent=2)
+        # The mutating methods edit the cached registry in place and keep its index current
+        if registry is not self._registry_cache:
+            self._set_registry_cache(copy.deepcopy(registry), self._registry_stamp)
+        self._registry_bytes = None
+        
+        if self._in_batch:
+            self._registry_dirty = True
+            return
+        
+        # Serialise once, write in one go, then atomically swap the file into place.
+        # A unique temp file keeps concurrent saves from writing into each other.
+        tmp_path = None
+        try:
+            data = _dumps(registry)
+            fd, tmp_name = tempfile.mkstemp(dir=self.registry_path.parent,
+                                            prefix=self.registry_path.name + '.', suffix='.tmp')
+            tmp_path = Path(tmp_name)
+            stamp = _stat_key(_write_bytes(fd, data))
+            
+            # mkstemp creates the file 0600; keep the registry's existing permissions
+            try:
+                os.chmod(tmp_path, self.registry_path.stat().st_mode & 0o777)
+            except FileNotFoundError:
+                os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.registry_path)
+        except BaseException:
+            # The cache no longer matches the file, so force the next read from disk
+            self._drop_registry_cache()
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+            raise
+        
+        self._registry_stamp = stamp
+        self._registry_bytes = data
+    
+    @contextmanager
+    def batch(self):
+        """Defer registry writes made inside the block to a single save on exit"""
+        if self._in_batch:
+            yield self
+            return
+        
+        self._in_batch = True
+        self._batch_ts = datetime.now().isoformat()
+        try:
+            yield self
+        finally:
+            self._in_batch = False
+            self._batch_ts = None
+            if self._registry_dirty:
+                self._registry_dirty = False
+                self.save_registry(self._registry_cache)
+    
+    def _timestamp(self) -> str:
+        """Timestamp for registry metadata, shared by every change in a batch"""
+        return self._batch_ts or datetime.now().isoformat()
     
     def list_templates(self) -> List[Dict]:
         """List all available templates"""
-        registry = self.load_registry()
-        return registry.get('templates', [])
+        return _loads(self._registry_snapshot()).get('templates', [])
     
     def get_template(self, template_id: str) -> Optional[Dict]:
         """Get a specific template by ID"""
-        templates = self.list_templates()
-        return next((t for t in templates if t['id'] == template_id), None)
+        registry = self._refresh_registry()
+        position = self._template_index.get(template_id)
+        if position is None:
+            return None
+        return copy.deepcopy(registry['templates'][position])
+    
+    def _find_project_keys(self, project_json: str, keys: List[str]) -> Set[str]:
+        """Return which of the given top-level keys a project.json file defines"""
+        if ijson is None:
+            project_data = _loads(Path(project_json).read_bytes())
+            return {key for key in keys if key in project_data}
+        
+        # Stream the whole file so malformed JSON is still reported, but only keep top-level keys
+        wanted = set(keys)
+        present = set()
+        with open(project_json, 'rb') as f:
+            for prefix, event, value in ijson.parse(f):
+                if prefix == '' and event == 'map_key' and value in wanted:
+                    present.add(value)
+        return present
     
     def validate_template(self, template_path: Path) -> Dict:
         """Validate a template structure"""
         issues = []
         warnings = []
         
+        # One directory read instead of a stat per checked name
+        try:
+            with os.scandir(template_path) as it:
+                entries = {entry.name: entry for entry in it}
+        except (FileNotFoundError, NotADirectoryError):
+            entries = {}
+        
         # Check required files
         required_files = ['README.md', 'project.json']
         for file in required_files:
-            if not (template_path / file).exists():
+            if file not in entries:
                 issues.append(f"Missing required file: {file}")
         
         # Check directory structure
         recommended_dirs = ['docs', 'scripts', 'templates']
         for dir_name in recommended_dirs:
-            if not (template_path / dir_name).exists():
+            if dir_name not in entries or not entries[dir_name].is_dir():
                 warnings.append(f"Missing recommended directory: {dir_name}")
         
         # Validate project.json
-        project_json = template_path / 'project.json'
-        if project_json.exists():
+        if 'project.json' in entries:
             try:
-                with open(project_json) as f:
-                    project_data = json.load(f)
-                    
                 required_keys = ['name', 'version', 'description']
+                present = self._find_project_keys(entries['project.json'].path, required_keys)
                 for key in required_keys:
-                    if key not in project_data:
+                    if key not in present:
                         issues.append(f"Missing key in project.json: {key}")
                         
-            except json.JSONDecodeError as e:
+            except _JSON_ERRORS as e:
                 issues.append(f"Invalid JSON in project.json: {e}")
         
         return {
@@ -84,6 +379,19 @@ class TemplateUpdater:
             'warnings': warnings
         }
     
+    def _source_fingerprint(self, source_path: str) -> Optional[Tuple]:
+        """Cheap identity for a template source, or None if it doesn't carry the required files"""
+        with os.scandir(source_path) as it:
+            entries = {entry.name: entry for entry in it}
+        
+        # Validity only depends on these files, which the copy carries over from the source
+        if 'README.md' not in entries or 'project.json' not in entries:
+            return None
+        
+        project_stat = entries['project.json'].stat()
+        layout = frozenset((name, entry.is_dir()) for name, entry in entries.items())
+        return layout, project_stat.st_size, project_stat.st_mtime_ns
+    
     def create_template(self, template_id: str, template_data: Dict, source_path: str):
         """Create a new template"""
         template_path = self.templates_path / template_id
@@ -92,70 +400,84 @@ class TemplateUpdater:
         template_path.mkdir(parents=True, exist_ok=True)
         
         # Copy source files if provided
+        fingerprint = None
         if source_path and Path(source_path).exists():
-            shutil.copytree(source_path, template_path, dirs_exist_ok=True)
+            fingerprint = self._source_fingerprint(source_path)
+            _parallel_copytree(source_path, template_path)
         
-        # Validate template
-        validation = self.validate_template(template_path)
-        if not validation['valid']:
-            print(f"Template validation failed: {validation['issues']}")
-            return False
+        # Validate template, unless this exact source already passed
+        if fingerprint is None or self._validated.get(template_id) != fingerprint:
+            validation = self.validate_template(template_path)
+            if not validation['valid']:
+                print(f"Template validation failed: {validation['issues']}")
+                return False
+            if fingerprint is not None:
+                self._validated[template_id] = fingerprint
         
         # Update registry
-        registry = self.load_registry()
-        templates = registry.get('templates', [])
-        
-        # Remove existing template with same ID
-        templates = [t for t in templates if t['id'] != template_id]
-        
-        # Add new template
-        templates.append(template_data)
-        registry['templates'] = templates
-        registry['metadata']['totalTemplates'] = len(templates)
-        registry['metadata']['lastUpdated'] = datetime.now().isoformat()
-        
-        self.save_registry(registry)
+        with self._editing_registry() as registry:
+            metadata = registry['metadata']
+            templates = registry.setdefault('templates', [])
+            
+            # Remove existing templates with same ID (the index only tells us one exists)
+            replacing = template_id in self._template_index
+            if replacing:
+                templates[:] = [t for t in templates if t.get('id') != template_id]
+            
+            # Add new template
+            templates.append(copy.deepcopy(template_data))
+            if replacing or template_data.get('id') != template_id:
+                self._reindex_templates()
+            else:
+                self._template_index[template_id] = len(templates) - 1
+            
+            metadata['totalTemplates'] = len(templates)
+            metadata['lastUpdated'] = self._timestamp()
+            
+            self.save_registry(registry)
         print(f"Template '{template_id}' created successfully!")
         return True
     
     def update_template(self, template_id: str, updates: Dict):
         """Update an existing template"""
-        registry = self.load_registry()
-        templates = registry.get('templates', [])
-        
-        template = next((t for t in templates if t['id'] == template_id), None)
-        if not template:
-            print(f"Template '{template_id}' not found")
-            return False
-        
-        # Apply updates
-        template.update(updates)
-        
-        # Update metadata
-        registry['metadata']['lastUpdated'] = datetime.now().isoformat()
-        
-        self.save_registry(registry)
+        with self._editing_registry() as registry:
+            position = self._template_index.get(template_id)
+            if position is None:
+                print(f"Template '{template_id}' not found")
+                return False
+            metadata = registry['metadata']
+            
+            # Apply updates
+            template = registry['templates'][position]
+            template.update(copy.deepcopy(updates))
+            if template.get('id') != template_id:
+                self._reindex_templates()
+            
+            # Update metadata
+            metadata['lastUpdated'] = self._timestamp()
+            
+            self.save_registry(registry)
         print(f"Template '{template_id}' updated successfully!")
         return True
     
     def remove_template(self, template_id: str):
         """Remove a template"""
         # Remove from registry
-        registry = self.load_registry()
-        templates = registry.get('templates', [])
-        
-        original_count = len(templates)
-        templates = [t for t in templates if t['id'] != template_id]
-        
-        if len(templates) == original_count:
-            print(f"Template '{template_id}' not found in registry")
-            return False
-        
-        registry['templates'] = templates
-        registry['metadata']['totalTemplates'] = len(templates)
-        registry['metadata']['lastUpdated'] = datetime.now().isoformat()
-        
-        self.save_registry(registry)
+        with self._editing_registry() as registry:
+            if template_id not in self._template_index:
+                print(f"Template '{template_id}' not found in registry")
+                return False
+            metadata = registry['metadata']
+            
+            # Drop every entry with this ID, not just the indexed first one
+            templates = registry['templates']
+            templates[:] = [t for t in templates if t.get('id') != template_id]
+            self._reindex_templates()
+            
+            metadata['totalTemplates'] = len(templates)
+            metadata['lastUpdated'] = self._timestamp()
+            
+            self.save_registry(registry)
         
         # Remove template directory
         template_path = self.templates_path / template_id
@@ -166,59 +488,199 @@ class TemplateUpdater:
         print(f"Template '{template_id}' removed successfully!")
         return True
     
-    def sync_from_remote(self, template_id: str, remote_url: str):
+    def _extract_archive(self, zip_ref: zipfile.ZipFile, dest: str):
+        """Extract all archive members, writing files concurrently"""
+        # ZipFile.extract creates parent directories without exist_ok, so let the
+        # first file of each directory (and directory entries) build the tree serially
+        seen_dirs = set()
+        parallel = []
+        for member in zip_ref.infolist():
+            parent = posixpath.dirname(member.filename.rstrip('/'))
+            if member.is_dir() or parent not in seen_dirs:
+                zip_ref.extract(member, dest)
+                seen_dirs.add(parent)
+            else:
+                parallel.append(member)
+        
+        # Reads are serialised by ZipFile's shared-file lock; writes overlap
+        with ThreadPoolExecutor(max_workers=MAX_IO_WORKERS) as pool:
+            futures = [pool.submit(zip_ref.extract, member, dest) for member in parallel]
+            for future in futures:
+                future.result()
+    
+    def _download(self, remote_url: str, spool, etag: Optional[str] = None) -> Optional[Dict]:
+        """Stream a remote archive into a file object, returning None if it is unchanged"""
+        headers = {'If-None-Match': etag} if etag else {}
+        digest = hashlib.blake2b()
+        try:
+            with urlopen(Request(remote_url, headers=headers)) as response:
+                while chunk := response.read(COPY_BUFFER_SIZE):
+                    digest.update(chunk)
+                    spool.write(chunk)
+                etag = response.headers.get('ETag')
+        except HTTPError as e:
+            if e.code == 304:
+                return None
+            raise
+        spool.seek(0)
+        return {'etag': etag, 'archiveHash': digest.hexdigest()}
+    
+    def _archive_state(self, template_id: str, force: bool = False) -> Dict:
+        """ETag and hash recorded for the installed archive, empty if it must be fetched in full"""
+        # Forcing ignores what was recorded, so local edits and deletions get repaired
+        if force or not (self.templates_path / template_id).exists():
+            return {}
+        try:
+            template = self.get_template(template_id)
+        except FileNotFoundError:
+            return {}
+        if template is None:
+            return {}
+        return {key: template[key] for key in ('etag', 'archiveHash') if template.get(key)}
+    
+    def _archive_changed(self, template_id: str, known: Dict, archive: Optional[Dict]) -> bool:
+        """Whether a download differs from the installed archive and needs extracting"""
+        if archive is not None and archive['archiveHash'] != known.get('archiveHash'):
+            return True
+        print(f"Template '{template_id}' is already up to date")
+        return False
+    
+    def _record_archive(self, template_id: str, archive: Optional[Dict]):
+        """Remember a downloaded archive's ETag and hash on its registry entry"""
+        if archive is None:
+            return
+        try:
+            registry = self._refresh_registry()
+        except FileNotFoundError:
+            return
+        position = self._template_index.get(template_id)
+        if position is None:
+            return
+        
+        template = registry['templates'][position]
+        if all(template.get(key) == value for key, value in archive.items()):
+            return
+        template.update(archive)
+        self.save_registry(registry)
+    
+    def _install_archive(self, template_id: str, spool) -> bool:
+        """Extract a downloaded template archive over the installed template"""
+        # Extract next to the templates so changed files can be renamed into place
+        self.templates_path.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(prefix='.sync-', dir=self.templates_path) as temp_dir:
+            # Extract
+            with zipfile.ZipFile(spool, 'r') as zip_ref:
+                self._extract_archive(zip_ref, temp_dir)
+            
+            # Find the extracted directory
+            extracted_dirs = [d for d in Path(temp_dir).iterdir() if d.is_dir()]
+            if not extracted_dirs:
+                raise ValueError("No directories found in downloaded archive")
+            
+            source_dir = extracted_dirs[0]
+            template_path = self.templates_path / template_id
+            
+            # Validate before touching the installed template, so an archive that
+            # isn't a template (e.g. a whole-repository zip) can't overwrite it
+            validation = self.validate_template(source_dir)
+            if validation['warnings']:
+                print("Warnings:", validation['warnings'])
+            
+            if not validation['valid']:
+                print("Errors:", validation['issues'])
+                print(f"Template '{template_id}' left unchanged")
+                return False
+            
+            # Update existing template, rewriting only the files that changed
+            _sync_tree(source_dir, template_path)
+            
+            print(f"Template '{template_id}' synced successfully!")
+            return True
+    
+    def sync_from_remote(self, template_id: str, remote_url: str, force: bool = False):
         """Sync a template from a remote source"""
         print(f"Syncing template '{template_id}' from {remote_url}")
         
         try:
-            # Download and extract
-            with tempfile.TemporaryDirectory() as temp_dir:
-                zip_path = Path(temp_dir) / "template.zip"
-                
-                response = requests.get(remote_url)
-                response.raise_for_status()
-                
-                with open(zip_path, 'wb') as f:
-                    f.write(response.content)
-                
-                # Extract
-                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    zip_ref.extractall(temp_dir)
-                
-                # Find the extracted directory
-                extracted_dirs = [d for d in Path(temp_dir).iterdir() if d.is_dir()]
-                if not extracted_dirs:
-                    raise ValueError("No directories found in downloaded archive")
-                
-                source_dir = extracted_dirs[0]
-                template_path = self.templates_path / template_id
-                
-                # Replace existing template
-                if template_path.exists():
-                    shutil.rmtree(template_path)
-                
-                shutil.copytree(source_dir, template_path)
-                
-                # Validate
-                validation = self.validate_template(template_path)
-                if validation['warnings']:
-                    print("Warnings:", validation['warnings'])
-                
-                if not validation['valid']:
-                    print("Errors:", validation['issues'])
-                    return False
-                
-                print(f"Template '{template_id}' synced successfully!")
+            known = self._archive_state(template_id, force)
+            
+            # Stream the archive; small ones stay in memory, large ones spill to disk
+            with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spool:
+                archive = self._download(remote_url, spool, known.get('etag'))
+                if self._archive_changed(template_id, known, archive):
+                    if not self._install_archive(template_id, spool):
+                        return False
+                self._record_archive(template_id, archive)
                 return True
                 
         except Exception as e:
             print(f"Failed to sync template: {e}")
             return False
+    
+    async def sync_many(self, jobs: List[Tuple[str, str]], concurrency: int = MAX_IO_WORKERS,
+                        force: bool = False) -> Dict[str, bool]:
+        """Sync several templates, overlapping their downloads"""
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        limit = asyncio.Semaphore(concurrency)
+        
+        async def download(session, remote_url: str, spool, etag: Optional[str]) -> Optional[Dict]:
+            if session is None:
+                return await asyncio.to_thread(self._download, remote_url, spool, etag)
+            
+            headers = {'If-None-Match': etag} if etag else {}
+            digest = hashlib.blake2b()
+            async with session.get(remote_url, headers=headers) as response:
+                if response.status == 304:
+                    return None
+                response.raise_for_status()
+                async for chunk in response.content.iter_chunked(COPY_BUFFER_SIZE):
+                    digest.update(chunk)
+                    spool.write(chunk)
+                etag = response.headers.get('ETag')
+            spool.seek(0)
+            return {'etag': etag, 'archiveHash': digest.hexdigest()}
+        
+        async def sync_one(session, template_id: str, remote_url: str) -> bool:
+            async with limit:
+                print(f"Syncing template '{template_id}' from {remote_url}")
+                try:
+                    known = self._archive_state(template_id, force)
+                    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spool:
+                        archive = await download(session, remote_url, spool, known.get('etag'))
+                        if self._archive_changed(template_id, known, archive):
+                            # Extraction and copying are blocking, keep them off the event loop
+                            if not await asyncio.to_thread(self._install_archive, template_id, spool):
+                                return False
+                        # Registry bookkeeping stays on the event loop thread
+                        self._record_archive(template_id, archive)
+                        return True
+                except Exception as e:
+                    print(f"Failed to sync template '{template_id}': {e}")
+                    return False
+        
+        async def run_all(session):
+            results = await asyncio.gather(*(sync_one(session, t, url) for t, url in jobs))
+            return {template_id: ok for (template_id, _), ok in zip(jobs, results)}
+        
+        # Without aiohttp the blocking urllib download runs on worker threads instead
+        if aiohttp is None:
+            return await run_all(None)
+        
+        connector = aiohttp.TCPConnector(limit=concurrency)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            return await run_all(session)
 
 def main():
     """CLI interface for template management"""
     import argparse
     
+    def positive_int(value: str) -> int:
+        number = int(value)
+        if number < 1:
+            raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+        return number
+    
     parser = argparse.ArgumentParser(description="S-cubed Template Updater")
     parser.add_argument('--base-path', help="Base path for S-cubed development process")
     
@@ -241,6 +703,15 @@ def main():
     sync_parser = subparsers.add_parser('sync', help='Sync template from remote')
     sync_parser.add_argument('template_id', help='Template ID to sync')
     sync_parser.add_argument('remote_url', help='Remote URL to sync from')
+    sync_parser.add_argument('--force', action='store_true',
+                             help='Re-download and re-install even if the template looks up to date')
+    
+    # Sync every template that has a download URL
+    sync_all_parser = subparsers.add_parser('sync-all', help='Sync all registry templates from their download URLs')
+    sync_all_parser.add_argument('--parallel', type=positive_int, default=MAX_IO_WORKERS,
+                                 help='Maximum number of concurrent downloads')
+    sync_all_parser.add_argument('--force', action='store_true',
+                                 help='Re-download and re-install even if templates look up to date')
     
     args = parser.parse_args()
     
@@ -289,7 +760,13 @@ def main():
             print("No updates specified")
     
     elif args.command == 'sync':
-        updater.sync_from_remote(args.template_id, args.remote_url)
+        updater.sync_from_remote(args.template_id, args.remote_url, args.force)
+    
+    elif args.command == 'sync-all':
+        jobs = [(t['id'], t['downloadUrl']) for t in updater.list_templates() if t.get('id') and t.get('downloadUrl')]
+        with updater.batch():
+            results = asyncio.run(updater.sync_many(jobs, args.parallel, args.force))
+        print(f"Synced {sum(results.values())}/{len(jobs)} templates")
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
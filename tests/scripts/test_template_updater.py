@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Template Updater tests
+Covers the registry cache and batching, the in-place re-sync of templates
+and the ETag/304 short-circuit.
+
+Run with: python3 -m unittest discover -s tests/scripts
+"""
+
+import asyncio
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# The script's file name has a hyphen, so load it by path
+_spec = importlib.util.spec_from_file_location(
+    "template_updater", REPO_ROOT / "shared" / "scripts" / "template-updater.py")
+template_updater = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(template_updater)
+
+TEMPLATE_ID = "sync-test"
+
+
+def write_tree(root: Path, files: dict):
+    """Create files (str content) and empty directories (None) under root"""
+    for rel, content in files.items():
+        path = root / rel
+        if content is None:
+            path.mkdir(parents=True, exist_ok=True)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+
+
+def list_tree(root: Path) -> list:
+    return sorted(p.relative_to(root).as_posix() for p in root.rglob("*"))
+
+
+def build_archive(files: dict) -> bytes:
+    """Zip files under a single top-level directory, like a GitHub archive"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for rel, content in sorted(files.items()):
+            # Fixed timestamps keep identical content byte-identical between builds
+            info = zipfile.ZipInfo(f"template-main/{rel}", (2024, 1, 1, 0, 0, 0))
+            archive.writestr(info, content)
+    return buffer.getvalue()
+
+
+class ArchiveServer:
+    """Serves one in-memory archive with an ETag, answering If-None-Match with 304"""
+
+    def __init__(self):
+        self.archive = b""
+        self.not_modified = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                etag = '"%s"' % hashlib.sha256(server.archive).hexdigest()
+                if self.headers.get("If-None-Match") == etag:
+                    server.not_modified += 1
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(server.archive)))
+                self.end_headers()
+                self.wfile.write(server.archive)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/template.zip"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+VALID_TEMPLATE = {
+    "README.md": "readme",
+    "project.json": json.dumps({"name": "t", "version": "1", "description": "d"}),
+    "docs/guide.md": "guide",
+    "scripts/run.py": "print('v1')",
+    "templates/prompt.md": "prompt",
+    "old/notes.md": "notes",
+    "flip-to-dir": "was a file",
+    "flip-to-file/inner.md": "was a dir",
+}
+
+
+class SyncTreeTests(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+
+    def test_resync_replaces_changed_keeps_unchanged_and_removes_orphans(self):
+        dst = self.root / "installed"
+        src = self.root / "incoming"
+        write_tree(dst, VALID_TEMPLATE)
+        write_tree(src, {
+            "README.md": "readme",
+            "project.json": VALID_TEMPLATE["project.json"],
+            "docs/guide.md": "guide v2",
+            "scripts/run.py": "print('v2')",
+            "templates/prompt.md": "prompt",
+            "new/added.md": "added",
+            "flip-to-dir/inner.md": "now a dir",
+            "flip-to-file": "now a file",
+        })
+        unchanged_inode = (dst / "README.md").stat().st_ino
+
+        template_updater._sync_tree(src, dst)
+
+        self.assertEqual(list_tree(dst), [
+            "README.md", "docs", "docs/guide.md", "flip-to-dir", "flip-to-dir/inner.md",
+            "flip-to-file", "new", "new/added.md", "project.json", "scripts",
+            "scripts/run.py", "templates", "templates/prompt.md",
+        ])
+        self.assertEqual((dst / "README.md").stat().st_ino, unchanged_inode)
+        self.assertEqual((dst / "docs/guide.md").read_text(), "guide v2")
+        # Same size, different content must still be replaced
+        self.assertEqual((dst / "scripts/run.py").read_text(), "print('v2')")
+        self.assertEqual((dst / "flip-to-dir/inner.md").read_text(), "now a dir")
+        self.assertEqual((dst / "flip-to-file").read_text(), "now a file")
+
+    def test_symlinks_in_installed_tree_are_replaced_not_followed(self):
+        dst = self.root / "installed"
+        src = self.root / "incoming"
+        outside = self.root / "outside"
+        write_tree(outside, {"guide.md": "outside guide", "keep.md": "outside"})
+        write_tree(dst, {"README.md": "readme"})
+        (dst / "docs").symlink_to(outside, target_is_directory=True)
+        (dst / "linked.md").symlink_to(outside / "keep.md")
+        write_tree(src, {"README.md": "readme", "docs/guide.md": "guide", "linked.md": "outside"})
+
+        template_updater._sync_tree(src, dst)
+
+        self.assertFalse((dst / "docs").is_symlink())
+        self.assertFalse((dst / "linked.md").is_symlink())
+        self.assertEqual((dst / "docs/guide.md").read_text(), "guide")
+        self.assertEqual((dst / "linked.md").read_text(), "outside")
+        self.assertEqual(list_tree(outside), ["guide.md", "keep.md"])
+        self.assertEqual((outside / "guide.md").read_text(), "outside guide")
+
+
+class RegistryTests(unittest.TestCase):
+    def setUp(self):
+        self.base = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.base, ignore_errors=True)
+        self.registry_file = self.base / "vscode-extension" / "template-registry.json"
+        self.write_registry([{"id": "a", "name": "A"}, {"id": "b", "name": "B"}])
+        self.source = self.base / "source"
+        write_tree(self.source, VALID_TEMPLATE)
+        self.updater = template_updater.TemplateUpdater(str(self.base))
+
+    def write_registry(self, templates: list):
+        write_tree(self.base, {"vscode-extension/template-registry.json": json.dumps({
+            "templates": templates, "metadata": {"totalTemplates": len(templates)}})})
+
+    def on_disk(self) -> dict:
+        return json.loads(self.registry_file.read_text())
+
+    def test_create_accepts_entry_without_id(self):
+        self.assertTrue(self.updater.create_template("c", {"name": "No ID"}, str(self.source)))
+
+        self.assertEqual([t.get("id") for t in self.on_disk()["templates"]], ["a", "b", None])
+        self.assertEqual(self.updater.load_registry(), self.on_disk())
+        # Later edits still work around the ID-less entry
+        self.assertTrue(self.updater.update_template("b", {"name": "B2"}))
+        self.assertTrue(self.updater.remove_template("a"))
+        self.assertEqual([t.get("id") for t in self.on_disk()["templates"]], ["b", None])
+
+    def test_external_rewrite_invalidates_cache(self):
+        self.assertEqual(self.updater.get_template("a")["name"], "A")
+        mtime_ns = self.registry_file.stat().st_mtime_ns
+
+        # Same mtime, different size
+        self.write_registry([{"id": "a", "name": "Edited A"}, {"id": "b", "name": "B"}])
+        os.utime(self.registry_file, ns=(mtime_ns, mtime_ns))
+        self.assertEqual(self.updater.get_template("a")["name"], "Edited A")
+
+        # Same mtime and size, new inode (an atomic replace by another process)
+        replacement = self.registry_file.with_suffix(".new")
+        replacement.write_text(self.registry_file.read_text().replace("Edited A", "Edited Z"))
+        os.utime(replacement, ns=(mtime_ns, mtime_ns))
+        os.replace(replacement, self.registry_file)
+        self.assertEqual(self.updater.get_template("a")["name"], "Edited Z")
+
+    def test_batch_writes_once_on_exit(self):
+        with mock.patch.object(template_updater.os, "replace", wraps=os.replace) as replace:
+            with self.updater.batch():
+                self.updater.update_template("a", {"name": "A2"})
+                self.updater.update_template("b", {"name": "B2"})
+                self.assertEqual(replace.call_count, 0)
+                # Reads inside the batch see the unsaved changes
+                self.assertEqual(self.updater.get_template("a")["name"], "A2")
+            self.assertEqual(replace.call_count, 1)
+
+        self.assertEqual([t["name"] for t in self.on_disk()["templates"]], ["A2", "B2"])
+
+    def test_batch_flushes_on_exception(self):
+        with self.assertRaises(RuntimeError):
+            with self.updater.batch():
+                self.updater.update_template("a", {"name": "A2"})
+                raise RuntimeError("interrupted")
+
+        self.assertEqual(self.on_disk()["templates"][0]["name"], "A2")
+
+    def test_nested_batch_joins_outer(self):
+        with mock.patch.object(template_updater.os, "replace", wraps=os.replace) as replace:
+            with self.updater.batch():
+                with self.updater.batch():
+                    self.updater.update_template("a", {"name": "A2"})
+                self.assertEqual(replace.call_count, 0)
+                self.updater.update_template("b", {"name": "B2"})
+            self.assertEqual(replace.call_count, 1)
+
+        self.assertEqual([t["name"] for t in self.on_disk()["templates"]], ["A2", "B2"])
+
+    def test_update_with_id_change_reindexes(self):
+        self.assertTrue(self.updater.update_template("a", {"id": "z"}))
+
+        self.assertIsNone(self.updater.get_template("a"))
+        self.assertEqual(self.updater.get_template("z")["name"], "A")
+        self.assertFalse(self.updater.update_template("a", {"name": "gone"}))
+        self.assertEqual([t["id"] for t in self.on_disk()["templates"]], ["z", "b"])
+
+    def test_remove_drops_every_duplicate(self):
+        self.write_registry([{"id": "a", "name": "A"}, {"id": "b", "name": "B"}, {"id": "a", "name": "A again"}])
+
+        self.assertTrue(self.updater.remove_template("a"))
+
+        registry = self.on_disk()
+        self.assertEqual([t["id"] for t in registry["templates"]], ["b"])
+        self.assertEqual(registry["metadata"]["totalTemplates"], 1)
+        self.assertIsNone(self.updater.get_template("a"))
+
+    def test_failed_save_drops_cache(self):
+        with mock.patch.object(template_updater, "_dumps", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.updater.update_template("a", {"name": "unsaved"})
+
+        # The cache is re-read from the untouched file, and no temp file is left behind
+        self.assertEqual(self.updater.get_template("a")["name"], "A")
+        self.assertEqual(os.listdir(self.registry_file.parent), [self.registry_file.name])
+
+
+class SyncFromRemoteTests(unittest.TestCase):
+    def setUp(self):
+        self.base = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.base, ignore_errors=True)
+        registry = {
+            "templates": [{"id": TEMPLATE_ID, "name": "Sync Test", "version": "1"}],
+            "metadata": {"totalTemplates": 1},
+        }
+        write_tree(self.base, {"vscode-extension/template-registry.json": json.dumps(registry)})
+
+        self.server = ArchiveServer()
+        self.addCleanup(self.server.close)
+        self.updater = template_updater.TemplateUpdater(str(self.base))
+        self.installed = self.updater.templates_path / TEMPLATE_ID
+
+    def sync(self) -> bool:
+        return self.updater.sync_from_remote(TEMPLATE_ID, self.server.url)
+
+    def test_resync_updates_in_place_and_records_etag(self):
+        self.server.archive = build_archive(VALID_TEMPLATE)
+        self.assertTrue(self.sync())
+        self.assertEqual(list_tree(self.installed), list_tree(self._expected(VALID_TEMPLATE)))
+        self.assertTrue(self.updater.get_template(TEMPLATE_ID)["etag"])
+
+        updated = dict(VALID_TEMPLATE)
+        updated["docs/guide.md"] = "guide v2"
+        del updated["old/notes.md"]
+        del updated["flip-to-dir"]
+        updated["flip-to-dir/inner.md"] = "now a dir"
+        self.server.archive = build_archive(updated)
+        self.assertTrue(self.sync())
+
+        self.assertEqual(list_tree(self.installed), list_tree(self._expected(updated)))
+        self.assertEqual((self.installed / "docs/guide.md").read_text(), "guide v2")
+
+    def test_not_modified_response_leaves_template_untouched(self):
+        self.server.archive = build_archive(VALID_TEMPLATE)
+        self.assertTrue(self.sync())
+        (self.installed / "local-note.md").write_text("kept")
+
+        self.assertTrue(self.sync())
+
+        self.assertEqual(self.server.not_modified, 1)
+        self.assertEqual((self.installed / "local-note.md").read_text(), "kept")
+
+    def test_force_repairs_edited_and_deleted_files(self):
+        self.server.archive = build_archive(VALID_TEMPLATE)
+        self.assertTrue(self.sync())
+        (self.installed / "docs/guide.md").write_text("locally edited")
+        shutil.rmtree(self.installed / "scripts")
+
+        # A plain re-sync trusts the recorded ETag and leaves the damage in place
+        self.assertTrue(self.sync())
+        self.assertEqual(self.server.not_modified, 1)
+        self.assertEqual((self.installed / "docs/guide.md").read_text(), "locally edited")
+
+        self.assertTrue(self.updater.sync_from_remote(TEMPLATE_ID, self.server.url, force=True))
+        self.assertEqual(self.server.not_modified, 1)
+        self.assertEqual(list_tree(self.installed), list_tree(self._expected(VALID_TEMPLATE)))
+        self.assertEqual((self.installed / "docs/guide.md").read_text(), "guide")
+
+        # sync_many, which sync-all uses, honours force the same way
+        (self.installed / "README.md").unlink()
+        results = asyncio.run(self.updater.sync_many([(TEMPLATE_ID, self.server.url)], force=True))
+        self.assertEqual(results, {TEMPLATE_ID: True})
+        self.assertEqual((self.installed / "README.md").read_text(), "readme")
+
+    def test_invalid_archive_does_not_replace_installed_template(self):
+        self.server.archive = build_archive(VALID_TEMPLATE)
+        self.assertTrue(self.sync())
+        before = list_tree(self.installed)
+
+        self.server.archive = build_archive({"src/app.py": "", "package.json": "{}"})
+        self.assertFalse(self.sync())
+
+        self.assertEqual(list_tree(self.installed), before)
+
+    def _expected(self, files: dict) -> Path:
+        expected = self.base / "expected"
+        shutil.rmtree(expected, ignore_errors=True)
+        write_tree(expected, files)
+        return expected
+
+
+if __name__ == "__main__":
+    unittest.main()
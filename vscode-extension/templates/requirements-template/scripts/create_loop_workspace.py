@@ -5,196 +5,197 @@ Automates creation of Loop workspaces with standardized templates
 """
 
 import os
+import copy
 import json
-import requests
+import string
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
-def load_project_info():
-    """Load project information from project.json"""
-    try:
-        with open("project.json", "r") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print("❌ project.json not found. Run 'Initialize New Project' first.")
-        return None
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def create_loop_templates():
-    """Create Loop workspace templates as JSON structures"""
-    
-    templates = {
-        "project_charter": {
-            "type": "loop_page",
-            "title": "Project Charter",
-            "content": {
-                "sections": [
-                    {
-                        "title": "Project Overview",
-                        "type": "text_block",
-                        "content": "Executive summary of the project"
-                    },
-                    {
-                        "title": "Problem Statement", 
-                        "type": "text_block",
-                        "content": "The specific problem this project solves"
-                    },
-                    {
-                        "title": "Success Criteria",
-                        "type": "checklist",
-                        "items": [
-                            "Define measurable success metrics",
-                            "Set target completion dates",
-                            "Identify key stakeholders"
-                        ]
-                    },
-                    {
-                        "title": "Scope & Boundaries",
-                        "type": "text_block",
-                        "content": "What's included and excluded from this project"
-                    }
-                ]
-            }
-        },
-        
-        "requirements_table": {
-            "type": "loop_table",
-            "title": "Requirements Register",
-            "columns": [
-                {"name": "Req ID", "type": "text"},
-                {"name": "Type", "type": "choice", "options": ["Functional", "Non-Functional", "Business"]},
-                {"name": "Description", "type": "text"},
-                {"name": "Priority", "type": "choice", "options": ["Must Have", "Should Have", "Could Have", "Won't Have"]},
-                {"name": "Status", "type": "choice", "options": ["Draft", "Approved", "In Development", "Complete"]},
-                {"name": "Owner", "type": "person"},
-                {"name": "Notes", "type": "text"}
+def _loads(data):
+    """Parse JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _dumps(obj) -> bytes:
+    """Serialise to indented JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode()
+
+# Static workspace structures, built and serialised once at import
+_LOOP_TEMPLATES = {
+    "project_charter": {
+        "type": "loop_page",
+        "title": "Project Charter",
+        "content": {
+            "sections": [
+                {
+                    "title": "Project Overview",
+                    "type": "text_block",
+                    "content": "Executive summary of the project"
+                },
+                {
+                    "title": "Problem Statement", 
+                    "type": "text_block",
+                    "content": "The specific problem this project solves"
+                },
+                {
+                    "title": "Success Criteria",
+                    "type": "checklist",
+                    "items": [
+                        "Define measurable success metrics",
+                        "Set target completion dates",
+                        "Identify key stakeholders"
+                    ]
+                },
+                {
+                    "title": "Scope & Boundaries",
+                    "type": "text_block",
+                    "content": "What's included and excluded from this project"
+                }
             ]
-        },
-        
-        "user_stories_table": {
-            "type": "loop_table", 
-            "title": "User Stories Backlog",
-            "columns": [
-                {"name": "Story ID", "type": "text"},
-                {"name": "Epic", "type": "text"},
-                {"name": "User Type", "type": "choice", "options": ["End User", "Admin", "System"]},
-                {"name": "Story", "type": "text"},
-                {"name": "Acceptance Criteria", "type": "text"},
-                {"name": "Priority", "type": "choice", "options": ["High", "Medium", "Low"]},
-                {"name": "Effort", "type": "choice", "options": ["XS", "S", "M", "L", "XL"]},
-                {"name": "Status", "type": "choice", "options": ["Backlog", "In Progress", "Review", "Done"]},
-                {"name": "Assigned To", "type": "person"}
+        }
+    },
+
+    "requirements_table": {
+        "type": "loop_table",
+        "title": "Requirements Register",
+        "columns": [
+            {"name": "Req ID", "type": "text"},
+            {"name": "Type", "type": "choice", "options": ["Functional", "Non-Functional", "Business"]},
+            {"name": "Description", "type": "text"},
+            {"name": "Priority", "type": "choice", "options": ["Must Have", "Should Have", "Could Have", "Won't Have"]},
+            {"name": "Status", "type": "choice", "options": ["Draft", "Approved", "In Development", "Complete"]},
+            {"name": "Owner", "type": "person"},
+            {"name": "Notes", "type": "text"}
+        ]
+    },
+
+    "user_stories_table": {
+        "type": "loop_table", 
+        "title": "User Stories Backlog",
+        "columns": [
+            {"name": "Story ID", "type": "text"},
+            {"name": "Epic", "type": "text"},
+            {"name": "User Type", "type": "choice", "options": ["End User", "Admin", "System"]},
+            {"name": "Story", "type": "text"},
+            {"name": "Acceptance Criteria", "type": "text"},
+            {"name": "Priority", "type": "choice", "options": ["High", "Medium", "Low"]},
+            {"name": "Effort", "type": "choice", "options": ["XS", "S", "M", "L", "XL"]},
+            {"name": "Status", "type": "choice", "options": ["Backlog", "In Progress", "Review", "Done"]},
+            {"name": "Assigned To", "type": "person"}
+        ]
+    },
+
+    "risk_register": {
+        "type": "loop_table",
+        "title": "Risk Register", 
+        "columns": [
+            {"name": "Risk ID", "type": "text"},
+            {"name": "Category", "type": "choice", "options": ["Technical", "Business", "Project", "Operational"]},
+            {"name": "Description", "type": "text"},
+            {"name": "Impact", "type": "choice", "options": ["High", "Medium", "Low"]},
+            {"name": "Probability", "type": "choice", "options": ["High", "Medium", "Low"]},
+            {"name": "Risk Score", "type": "formula", "formula": "Impact * Probability"},
+            {"name": "Mitigation", "type": "text"},
+            {"name": "Owner", "type": "person"},
+            {"name": "Status", "type": "choice", "options": ["Open", "Mitigated", "Closed"]}
+        ]
+    },
+
+    "architecture_decisions": {
+        "type": "loop_page",
+        "title": "Architecture Decision Records",
+        "content": {
+            "sections": [
+                {
+                    "title": "ADR Template",
+                    "type": "text_block", 
+                    "content": "Use this template for each major architectural decision"
+                },
+                {
+                    "title": "Decision Log",
+                    "type": "table",
+                    "columns": ["ADR #", "Title", "Status", "Date", "Decision Owner"]
+                }
             ]
+        }
+    }
+}
+
+_POWER_AUTOMATE_FLOW = {
+    "flow_name": "AI Project Discovery - Loop Integration",
+    "trigger": {
+        "type": "manual_trigger",
+        "inputs": [
+            {"name": "project_name", "type": "string"},
+            {"name": "discovery_output", "type": "string"},
+            {"name": "output_type", "type": "choice", "options": ["requirements", "user_stories", "risks", "architecture"]}
+        ]
+    },
+    "actions": [
+        {
+            "name": "Parse Discovery Output",
+            "type": "ai_builder_extract_entities",
+            "settings": {
+                "model": "custom_entity_extraction",
+                "entities": ["requirements", "user_stories", "risks", "decisions"]
+            }
         },
-        
-        "risk_register": {
-            "type": "loop_table",
-            "title": "Risk Register", 
-            "columns": [
-                {"name": "Risk ID", "type": "text"},
-                {"name": "Category", "type": "choice", "options": ["Technical", "Business", "Project", "Operational"]},
-                {"name": "Description", "type": "text"},
-                {"name": "Impact", "type": "choice", "options": ["High", "Medium", "Low"]},
-                {"name": "Probability", "type": "choice", "options": ["High", "Medium", "Low"]},
-                {"name": "Risk Score", "type": "formula", "formula": "Impact * Probability"},
-                {"name": "Mitigation", "type": "text"},
-                {"name": "Owner", "type": "person"},
-                {"name": "Status", "type": "choice", "options": ["Open", "Mitigated", "Closed"]}
-            ]
+        {
+            "name": "Create Loop Workspace",
+            "type": "http_request",
+            "settings": {
+                "method": "POST",
+                "uri": "https://graph.microsoft.com/v1.0/me/onenote/sections",
+                "headers": {
+                    "Authorization": "Bearer @{triggerBody()['token']}",
+                    "Content-Type": "application/json"
+                }
+            }
         },
-        
-        "architecture_decisions": {
-            "type": "loop_page",
-            "title": "Architecture Decision Records",
-            "content": {
-                "sections": [
+        {
+            "name": "Populate Loop Tables",
+            "type": "apply_to_each",
+            "settings": {
+                "foreach": "@outputs('Parse_Discovery_Output')?['body']",
+                "actions": [
                     {
-                        "title": "ADR Template",
-                        "type": "text_block", 
-                        "content": "Use this template for each major architectural decision"
-                    },
-                    {
-                        "title": "Decision Log",
-                        "type": "table",
-                        "columns": ["ADR #", "Title", "Status", "Date", "Decision Owner"]
+                        "name": "Add Table Row",
+                        "type": "http_request",
+                        "settings": {
+                            "method": "POST",
+                            "uri": "https://graph.microsoft.com/v1.0/sites/{site-id}/lists/{list-id}/items"
+                        }
                     }
                 ]
             }
-        }
-    }
-    
-    return templates
-
-def generate_power_automate_flow():
-    """Generate Power Automate flow configuration"""
-    
-    flow_config = {
-        "flow_name": "AI Project Discovery - Loop Integration",
-        "trigger": {
-            "type": "manual_trigger",
-            "inputs": [
-                {"name": "project_name", "type": "string"},
-                {"name": "discovery_output", "type": "string"},
-                {"name": "output_type", "type": "choice", "options": ["requirements", "user_stories", "risks", "architecture"]}
-            ]
         },
-        "actions": [
-            {
-                "name": "Parse Discovery Output",
-                "type": "ai_builder_extract_entities",
-                "settings": {
-                    "model": "custom_entity_extraction",
-                    "entities": ["requirements", "user_stories", "risks", "decisions"]
-                }
-            },
-            {
-                "name": "Create Loop Workspace",
-                "type": "http_request",
-                "settings": {
-                    "method": "POST",
-                    "uri": "https://graph.microsoft.com/v1.0/me/onenote/sections",
-                    "headers": {
-                        "Authorization": "Bearer @{triggerBody()['token']}",
-                        "Content-Type": "application/json"
-                    }
-                }
-            },
-            {
-                "name": "Populate Loop Tables",
-                "type": "apply_to_each",
-                "settings": {
-                    "foreach": "@outputs('Parse_Discovery_Output')?['body']",
-                    "actions": [
-                        {
-                            "name": "Add Table Row",
-                            "type": "http_request",
-                            "settings": {
-                                "method": "POST",
-                                "uri": "https://graph.microsoft.com/v1.0/sites/{site-id}/lists/{list-id}/items"
-                            }
-                        }
-                    ]
-                }
-            },
-            {
-                "name": "Notify Stakeholders",
-                "type": "teams_post_message",
-                "settings": {
-                    "team": "Project Team",
-                    "channel": "General",
-                    "message": "🤖 AI Discovery completed for @{triggerBody()['project_name']}. Loop workspace updated with new insights."
-                }
+        {
+            "name": "Notify Stakeholders",
+            "type": "teams_post_message",
+            "settings": {
+                "team": "Project Team",
+                "channel": "General",
+                "message": "🤖 AI Discovery completed for @{triggerBody()['project_name']}. Loop workspace updated with new insights."
             }
-        ]
-    }
-    
-    return flow_config
+        }
+    ]
+}
 
-def create_setup_instructions(project_info):
-    """Create setup instructions for Loop integration"""
-    
-    instructions = f"""# Loop Workspace Setup Instructions
+_LOOP_TEMPLATES_JSON = _dumps(_LOOP_TEMPLATES)
+_POWER_AUTOMATE_FLOW_JSON = _dumps(_POWER_AUTOMATE_FLOW)
+
+_SETUP_TEMPLATE = string.Template("""# Loop Workspace Setup Instructions
 
-## Project: {project_info['name']}
+## Project: ${name}
 
 ### Prerequisites
 - Microsoft 365 account with Loop access
@@ -203,7 +204,7 @@ def create_setup_instructions(project_info):
 
 ### Step 1: Create Loop Workspace
 1. Open Microsoft Loop (loop.microsoft.com)
-2. Create new workspace: "{project_info['name']} - AI Development"
+2. Create new workspace: "${name} - AI Development"
 3. Copy workspace URL to project.json
 
 ### Step 2: Import Templates
@@ -271,9 +272,28 @@ python scripts/sync_loop_to_docs.py
 2. Test Power Automate flow
 3. Run first discovery session with Claude
 4. Validate automation workflow
-"""
-    
-    return instructions
+""")
+
+def load_project_info():
+    """Load project information from project.json"""
+    try:
+        return _loads(Path("project.json").read_bytes())
+    except FileNotFoundError:
+        print("❌ project.json not found. Run 'Initialize New Project' first.")
+        return None
+
+def create_loop_templates():
+    """Create Loop workspace templates as JSON structures"""
+    # A copy, so callers can't change what later calls (and the module's JSON) start from
+    return copy.deepcopy(_LOOP_TEMPLATES)
+
+def generate_power_automate_flow():
+    """Generate Power Automate flow configuration"""
+    return copy.deepcopy(_POWER_AUTOMATE_FLOW)
+
+def create_setup_instructions(project_info):
+    """Create setup instructions for Loop integration"""
+    return _SETUP_TEMPLATE.substitute(name=project_info['name'])
 
 def main():
     """Create Loop workspace integration"""
@@ -289,30 +309,22 @@ def main():
         automation_path = Path("scripts/automation")
         automation_path.mkdir(exist_ok=True)
         
-        # Generate Loop templates
-        templates = create_loop_templates()
-        with open(automation_path / "loop_templates.json", "w") as f:
-            json.dump(templates, f, indent=2)
-        print("✅ Created: loop_templates.json")
-        
-        # Generate Power Automate flow
-        flow_config = generate_power_automate_flow()
-        with open(automation_path / "loop_integration_flow.json", "w") as f:
-            json.dump(flow_config, f, indent=2)
-        print("✅ Created: loop_integration_flow.json")
-        
-        # Create setup instructions
-        instructions = create_setup_instructions(project_info)
-        with open("docs/LOOP_SETUP.md", "w") as f:
-            f.write(instructions)
-        print("✅ Created: LOOP_SETUP.md")
+        # Loop templates, Power Automate flow and setup instructions are independent
+        artifacts = [
+            (automation_path / "loop_templates.json", _LOOP_TEMPLATES_JSON),
+            (automation_path / "loop_integration_flow.json", _POWER_AUTOMATE_FLOW_JSON),
+            (Path("docs/LOOP_SETUP.md"), create_setup_instructions(project_info).encode()),
+        ]
+        with ThreadPoolExecutor(max_workers=len(artifacts)) as pool:
+            list(pool.map(lambda artifact: artifact[0].write_bytes(artifact[1]), artifacts))
+        for path, _ in artifacts:
+            print(f"✅ Created: {path.name}")
         
         # Update project metadata
         project_info["loop_workspace"]["setup_ready"] = True
         project_info["loop_workspace"]["templates_created"] = datetime.now().isoformat()
         
-        with open("project.json", "w") as f:
-            json.dump(project_info, f, indent=2)
+        Path("project.json").write_bytes(_dumps(project_info))
         
         print(f"\n🎉 Loop integration setup completed!")
         print("📁 Templates: scripts/automation/")